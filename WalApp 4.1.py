@@ -1,30 +1,112 @@
-import time, csv, re, pickle, os
+import time, csv, re, pickle, os, sys, signal, multiprocessing, sqlite3, itertools, asyncio, logging, threading
 from datetime import datetime, timedelta
+from functools import lru_cache
+from contextlib import closing
 from urllib.parse import urlparse, parse_qs, unquote
+from multiprocessing.util import Finalize
+from logging.handlers import QueueHandler, QueueListener
 
+import httpx
+import lxml.html
+from lxml import etree
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException, ElementClickInterceptedException, StaleElementReferenceException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import NoSuchElementException, ElementClickInterceptedException, StaleElementReferenceException, TimeoutException
 
 # ---------- Config ----------
 DEFAULT_ZIP = "10009"
 OUTPUT_CSV = "walmart_filtered_links.csv"
 STATUS_CSV = "walmart_links_status.csv"
+CSV_BUFFER = 1 << 16  # bytes buffered for the status log; holds a whole batch of rows
+CSV_BATCH = 64  # status rows written (and flushed) together
 COOKIES_FILE = "walmart_cookies.pkl"
+CHECKED_DB = "walmart_checked.sqlite"  # verdicts from earlier runs, keyed by target month + link
+CHECKED_TTL_DAYS = 7  # verdicts older than this are checked again
+CHECKED_CURRENT_FAIL_TTL_HOURS = 6  # current-month FAILs expire sooner: new reviews keep arriving
+CHECKED_COMMIT_EVERY = 100  # verdicts written per cache transaction
+PROFILE_DIR = "chrome_profile"  # reused between runs: keeps cookies, cache and fingerprint
+VERIFIED_FILE = os.path.join(PROFILE_DIR, ".verified")
 MAX_PAGES_SAFETY = 500
+FILTER_WORKERS = 4  # browser processes checking product pages in parallel
+WORKER_HEADLESS = True  # run worker browsers without a window; set False if they get bot-checked
+WAIT_TIMEOUT = 5  # max seconds to wait for an element before giving up
+MIN_REVIEWS_IN_MONTH = 5  # reviews needed in the target month for a product to pass
+OLDER_IN_A_ROW = 3  # consecutive older-than-target reviews that end a newest-first scan
+LOG_FILE = "walmart_scraper.log"  # full run log; the console gets the same lines without timestamps
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")  # DEBUG adds every product, failure and review month seen
+LOG_PROGRESS_EVERY = 50  # products between progress lines (every product at DEBUG level)
+REVIEWS_URL = "https://www.walmart.com/reviews/product/{item_id}?sort=submission-desc"
+HTTP_CONCURRENCY = 20  # review pages fetched at once over plain HTTP
+HTTP_TIMEOUT = 15  # seconds per review page request
+_SEARCH_LINK_SELECTOR = "a[link-identifier], a[href*='/ip/']"
+# URL globs a worker browser never downloads; trailing * covers resizing query strings
+_BLOCKED_ASSETS = [
+    "*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.avif*",
+    "*.woff*", "*.ttf*", "*.otf*", "*.mp4*", "*.webm*", "*.m3u8*",
+]
+_NEXT_SELECTOR = "a[data-testid='NextPage'], button[aria-label='Next Page'], a[aria-label='Next Page']"
+_SELLER_SELECTOR = (
+    "a[data-automation-id='seller-name-link'], div[data-automation-id='seller-name'], "
+    "span[class*='seller'], li.seller, div.seller"
+)
 
 MONTHS = [
     'january','february','march','april','may','june','july','august','september','october','november','december'
 ]
 SHORT_MONTHS = {m[:3]: i+1 for i,m in enumerate(MONTHS)}
+_MONTH_ABBR = tuple(m[:3].title() for m in MONTHS)
+
+# ---------- Precompiled patterns ----------
+_YEAR_MONTH_RE = re.compile(r"^(\d{4})-(\d{1,2})$")
+_HAS_MONTH_RE = re.compile("|".join(_MONTH_ABBR))
+# Month alternatives share their prefixes and every quantifier is followed by a
+# disjoint character class, so a failed match never re-tries an earlier branch.
+_ABS_DATE_RE = re.compile(
+    r"\b(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|June?|July?|Aug(?:ust)?"
+    r"|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+\d{1,2}(?:,\s*|\s+)\d{4}\b",
+    re.IGNORECASE,
+)
+_REL_DATE_RE = re.compile(r"\b(\d{1,4})\s+(day|week|hour|month)s?\s+ago\b")
+_VISIT_STORE_RE = re.compile(r"visit\s+the\s+store\s+(.+)", re.IGNORECASE)
+_BRAND_JUNK_RE = re.compile(r"[^A-Za-z0-9 &-]")
+_BOT_RE = re.compile(r"robot|captcha|verify|human|\bbot\b|suspicious|blocked|access denied", re.IGNORECASE)
+
+# ---------- Logging ----------
+log = logging.getLogger("scraper")
+
+def start_logging(level=LOG_LEVEL):
+    """Log to the console and LOG_FILE. Returns (queue, listener): workers log into the
+    queue and the listener writes their records through the same handlers."""
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter("%(message)s"))
+    logfile = logging.FileHandler(LOG_FILE, encoding="utf-8")
+    logfile.setFormatter(logging.Formatter("%(asctime)s %(processName)s %(levelname)s %(message)s"))
+    log.addHandler(console)
+    log.addHandler(logfile)
+    try:
+        log.setLevel(level.upper())
+    except ValueError:
+        log.setLevel(logging.INFO)
+        log.warning(f"⚠️ Unknown LOG_LEVEL {level!r}, using INFO")
+    queue = multiprocessing.Queue()
+    listener = QueueListener(queue, console, logfile, respect_handler_level=True)
+    listener.start()
+    return queue, listener
+
+def _log_to_queue(queue, level):
+    """In a worker: send every record to the main process instead of writing it here."""
+    log.handlers[:] = [QueueHandler(queue)]
+    log.setLevel(level)
 
 # ---------- Cookies ----------
 def save_cookies(driver, path=COOKIES_FILE):
     try:
         pickle.dump(driver.get_cookies(), open(path, "wb"))
-        print(f"💾 Cookies saved to {path}")
+        log.info(f"💾 Cookies saved to {path}")
     except Exception as e:
-        print(f"⚠️ Could not save cookies: {e}")
+        log.warning(f"⚠️ Could not save cookies: {e}")
 
 def load_cookies(driver, path=COOKIES_FILE):
     if os.path.exists(path):
@@ -32,11 +114,39 @@ def load_cookies(driver, path=COOKIES_FILE):
             cookies = pickle.load(open(path, "rb"))
             for cookie in cookies:
                 driver.add_cookie(cookie)
-            print(f"✅ Cookies loaded from {path}")
+            log.info(f"✅ Cookies loaded from {path}")
         except Exception as e:
-            print(f"⚠️ Could not load cookies: {e}")
+            log.warning(f"⚠️ Could not load cookies: {e}")
     else:
-        print("ℹ️ No cookies file found, starting fresh session.")
+        log.info("ℹ️ No cookies file found, starting fresh session.")
+
+# ---------- Verdict cache ----------
+def open_checked_db(path=CHECKED_DB):
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS verdict("
+        "link TEXT, target TEXT, status TEXT, reason TEXT, ts INTEGER, PRIMARY KEY (target, link))"
+    )
+    return conn
+
+def load_checked(conn, target_tag) -> dict[str, tuple[bool, str]]:
+    """Fresh verdicts for the target month, as {link: (passed, reason)}."""
+    now = int(time.time())
+    cutoff = now - CHECKED_TTL_DAYS * 86400
+    fail_cutoff = cutoff
+    if target_tag == datetime.now().strftime("%Y-%m"):
+        fail_cutoff = max(cutoff, now - CHECKED_CURRENT_FAIL_TTL_HOURS * 3600)
+    rows = conn.execute(
+        "SELECT link, status, reason FROM verdict WHERE target=? AND ts > (CASE status WHEN 'FAIL' THEN ? ELSE ? END)",
+        (target_tag, fail_cutoff, cutoff),
+    )
+    return {link: (status == "PASS", reason) for link, status, reason in rows}
+
+def save_checked(conn, target_tag, link, status, reason):
+    conn.execute(
+        "INSERT OR REPLACE INTO verdict VALUES (?,?,?,?,?)",
+        (link, target_tag, status, reason, int(time.time())),
+    )
 
 # ---------- Utilities ----------
 def clean_product_link(href: str) -> str | None:
@@ -44,35 +154,25 @@ def clean_product_link(href: str) -> str | None:
     if not href:
         return None
     href = href.strip()
+    # Fast path: plain product links already contain /ip/, no decoding or URL parsing needed
+    idx = href.find("/ip/")
+    if idx >= 0:
+        return "https://www.walmart.com" + href[idx:].split("?", 1)[0]
     try:
+        # Encoded links, e.g. tracking redirects carrying the product URL
         unq = unquote(href)
-        if "/ip/" in unq:
-            idx = unq.find("/ip/")
-            part = unq[idx:]
-            if "?" in part:
-                part = part.split("?", 1)[0]
-            if part.startswith("/ip/"):
-                return "https://www.walmart.com" + part
-            return part
+        idx = unq.find("/ip/")
+        if idx >= 0:
+            return "https://www.walmart.com" + unq[idx:].split("?", 1)[0]
 
         parsed = urlparse(href)
         qs = parse_qs(parsed.query)
         if "rd" in qs:
             rd = unquote(qs["rd"][0])
-            if "/ip/" in rd:
-                idx = rd.find("/ip/")
-                part = rd[idx:]
-                if "?" in part:
-                    part = part.split("?", 1)[0]
-                return "https://www.walmart.com" + part
+            idx = rd.find("/ip/")
+            if idx >= 0:
+                return "https://www.walmart.com" + rd[idx:].split("?", 1)[0]
             return rd
-
-        if "/ip/" in href:
-            idx = href.find("/ip/")
-            part = href[idx:]
-            if "?" in part:
-                part = part.split("?", 1)[0]
-            return "https://www.walmart.com" + part
     except Exception:
         return None
     return None
@@ -87,17 +187,13 @@ def ask_target_month_year() -> tuple[int,int,str]:
     raw_l = raw.lower()
     
     if raw_l == 'current':
-        month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-                      'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-        return now.month, now.year, f"{month_names[now.month-1]} {now.year}"
+        return now.month, now.year, f"{_MONTH_ABBR[now.month-1]} {now.year}"
     
     # try YYYY-MM
-    m = re.match(r"^(\d{4})-(\d{1,2})$", raw)
+    m = _YEAR_MONTH_RE.match(raw)
     if m:
         y = int(m.group(1)); mo = int(m.group(2))
-        month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-                      'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-        return mo, y, f"{month_names[mo-1]} {y}"
+        return mo, y, f"{_MONTH_ABBR[mo-1]} {y}"
     
     # try 'Aug 2025' or 'August 2025'
     parts = raw.split()
@@ -114,15 +210,24 @@ def ask_target_month_year() -> tuple[int,int,str]:
             pass
     
     print("Could not parse month. Defaulting to current month.")
-    month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-                  'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-    return now.month, now.year, f"{month_names[now.month-1]} {now.year}"
+    return now.month, now.year, f"{_MONTH_ABBR[now.month-1]} {now.year}"
 
 def format_date_for_comparison(d: datetime) -> str:
     """Convert datetime to 'Mon YYYY' format for comparison (e.g., 'Apr 2025')"""
-    month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-                  'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-    return f"{month_names[d.month-1]} {d.year}"
+    return f"{_MONTH_ABBR[d.month-1]} {d.year}"
+
+def _date_from_tokens(mon: str, day: str, year: str) -> datetime | None:
+    """Build a datetime from ('Aug', '23', '2025') style tokens without strptime."""
+    mon = mon.lower()
+    mo = SHORT_MONTHS.get(mon[:3])
+    if not mo or not (len(mon) == 3 or mon == 'sept' or mon == MONTHS[mo-1]):
+        return None
+    if not (day.isdigit() and len(day) <= 2 and year.isdigit() and len(year) == 4):
+        return None
+    try:
+        return datetime(int(year), mo, int(day))
+    except ValueError:
+        return None
 
 def parse_review_date(text: str) -> datetime | None:
     """Parse a date from review tile text; returns datetime or None."""
@@ -131,27 +236,33 @@ def parse_review_date(text: str) -> datetime | None:
     t = text.strip()
     t_low = t.lower()
 
-    # Absolute date like 'August 23, 2025' or 'Aug 23, 2025' or 'Apr 14, 2025'
-    months_pattern = r"(January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)"
-    abs_match = re.search(rf"{months_pattern}\s+\d{{1,2}},?\s+\d{{4}}", t, re.IGNORECASE)
+    # Absolute date like 'August 23, 2025' or 'Aug 23, 2025' or 'Apr 14, 2025'.
+    # Date divs hold just the date, so try the leading tokens before scanning.
+    tokens = t.replace(',', ' ').split(maxsplit=3)
+    if len(tokens) >= 3:
+        d = _date_from_tokens(*tokens[:3])
+        if d:
+            return d
+    abs_match = _ABS_DATE_RE.search(t)
     if abs_match:
-        s = abs_match.group(0)
-        try:
-            from datetime import datetime as _dt
-            # Try both full month and abbreviated formats
-            for fmt in ["%B %d, %Y", "%b %d, %Y", "%B %d,%Y", "%b %d,%Y"]:
-                try:
-                    d = _dt.strptime(s, fmt)
-                    return d
-                except Exception:
-                    continue
-        except Exception:
-            pass
+        d = _date_from_tokens(*abs_match.group(0).replace(',', ' ').split())
+        if d:
+            return d
 
     # Relative like '2 days ago' or 'yesterday'
-    rel = re.search(r"(\d+)\s+(day|days|week|weeks|hour|hours|month|months)\s+ago", t_low)
+    rel = None
+    if t_low.endswith(' ago'):
+        parts = t_low.split()
+        # same bounds as _REL_DATE_RE: ASCII digits only, at most 4 of them
+        n = parts[-3] if len(parts) >= 3 else ""
+        if n.isascii() and n.isdigit() and len(n) <= 4:
+            rel = (n, parts[-2])
+    if rel is None:
+        m = _REL_DATE_RE.search(t_low)
+        if m:
+            rel = m.groups()
     if rel:
-        val = int(rel.group(1)); unit = rel.group(2)
+        val = int(rel[0]); unit = rel[1]
         now = datetime.now()
         if 'day' in unit:
             return now - timedelta(days=val)
@@ -173,17 +284,8 @@ def verify_bot_detection(driver):
     print("\n🤖 Checking for bot detection...")
     time.sleep(3)
     
-    # Check for common bot detection indicators
-    bot_indicators = [
-        "robot", "captcha", "verify", "human", "bot", 
-        "suspicious", "blocked", "access denied"
-    ]
-    
-    page_source_lower = driver.page_source.lower()
-    page_title_lower = driver.title.lower()
-    
-    detected = any(indicator in page_source_lower or indicator in page_title_lower 
-                  for indicator in bot_indicators)
+    # Check for common bot detection indicators in one pass, without lowercasing the page
+    detected = bool(_BOT_RE.search(driver.title) or _BOT_RE.search(driver.page_source))
     
     if detected:
         # print("⚠️ Potential bot detection found!")
@@ -228,40 +330,79 @@ def click_close_popup(driver):
     return False
 
 # ---------- Browser helpers ----------
+def wait_for(driver, locator, timeout=WAIT_TIMEOUT, visible=False) -> bool:
+    """Wait until an element matching locator is present (or visible). Returns False on timeout."""
+    condition = EC.visibility_of_element_located if visible else EC.presence_of_element_located
+    try:
+        WebDriverWait(driver, timeout).until(condition(locator))
+        return True
+    except TimeoutException:
+        return False
+
+def make_driver(headless=False, block_assets=False, **kwargs):
+    """Start an undetected Chrome with the scraper's standard options; kwargs go to uc.Chrome.
+
+    block_assets stops images, fonts and video from loading. The search browser keeps them,
+    since bot-verification challenges may need them.
+    """
+    options = uc.ChromeOptions()
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument("--disable-web-security")
+    options.add_argument("--disable-features=VizDisplayCompositor")
+    # return from driver.get() at DOMContentLoaded instead of waiting for every
+    # image/ad/tracker; the helpers below already wait for the nodes they need
+    options.page_load_strategy = "eager"
+    if headless:
+        options.add_argument("--disable-gpu")
+    if block_assets:
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+
+    driver = uc.Chrome(options=options, headless=headless, **kwargs)
+    driver.set_window_size(1400,900)
+    if block_assets:
+        # Stylesheets stay: is_displayed()/offsetParent checks depend on layout
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _BLOCKED_ASSETS})
+        except Exception as e:
+            log.warning(f"⚠️ Could not block page assets: {e}")
+    return driver
+
 def collect_links_from_search_page(driver):
     """Collect cleaned product links on the currently loaded search results page."""
-    time.sleep(1)  # let lazy load finish
-    elems = driver.find_elements(By.CSS_SELECTOR, "a[link-identifier], a[href*='/ip/']")
-    links = set()
-    for e in elems:
-        try:
-            href = e.get_attribute('href')
-            cl = clean_product_link(href)
-            if cl:
-                links.add(cl)
-        except Exception:
-            continue
-    return links
+    wait_for(driver, (By.CSS_SELECTOR, _SEARCH_LINK_SELECTOR))
+    # one round-trip for every href instead of a get_attribute call per anchor
+    try:
+        hrefs = driver.execute_script(
+            "return Array.from(document.querySelectorAll(arguments[0]), a => a.href);",
+            _SEARCH_LINK_SELECTOR,
+        ) or []
+    except Exception:
+        hrefs = []
+    # dict keeps page order, a set would shuffle it
+    return list(dict.fromkeys(cl for cl in map(clean_product_link, hrefs) if cl))
 
 def click_next(driver) -> bool:
-    selectors = [
-        "a[data-testid='NextPage']",
-        "button[aria-label='Next Page']",
-        "a[aria-label='Next Page']",
-    ]
-    for sel in selectors:
+    try:
+        btns = driver.find_elements(By.CSS_SELECTOR, _NEXT_SELECTOR)
+        # client-side paging keeps the old results in the DOM until it re-renders, so wait
+        # for one of them to go stale rather than for the URL, which changes first
+        old_results = driver.find_elements(By.CSS_SELECTOR, _SEARCH_LINK_SELECTOR)[:1]
+    except Exception:
+        return False
+    for btn in btns:
         try:
-            btns = driver.find_elements(By.CSS_SELECTOR, sel)
-            if btns:
-                btn = btns[0]
-                if btn.is_displayed():
-                    try:
-                        driver.execute_script("arguments[0].scrollIntoView({block:'center'});", btn)
-                        driver.execute_script("arguments[0].click();", btn)
-                        time.sleep(1.2)
-                        return True
-                    except Exception:
-                        continue
+            if btn.is_displayed():
+                old_url = driver.current_url
+                driver.execute_script("arguments[0].scrollIntoView({block:'center'});", btn)
+                driver.execute_script("arguments[0].click();", btn)
+                page_changed = EC.staleness_of(old_results[0]) if old_results else EC.url_changes(old_url)
+                try:
+                    WebDriverWait(driver, WAIT_TIMEOUT).until(page_changed)
+                except TimeoutException:
+                    pass
+                return True
         except Exception:
             continue
     return False
@@ -292,111 +433,209 @@ def extract_brand_from_page(driver) -> str:
             t = (n.text or "")
             if 'Visit the store' in t:
                 # try to extract brand following phrase
-                m = re.search(r"Visit the store\s*(.*)", t, re.IGNORECASE)
+                m = _VISIT_STORE_RE.search(t)
                 if m:
                     candidate = m.group(1).strip()
                     # cleanup
-                    candidate = re.sub(r"[^A-Za-z0-9 &-]", "", candidate).strip()
+                    candidate = _BRAND_JUNK_RE.sub("", candidate).strip()
                     if candidate:
                         return candidate
     except Exception:
         pass
     return ""
 
+# Opens the reviews sort menu and picks "Most recent" inside the page, polling up
+# to ~3s for the option to render, then falls back to native <select> menus.
+# Resolves to true once an option was chosen.
+_SORT_MOST_RECENT_JS = """
+const isRecent = e => /^(most recent|newest)$/i.test((e.innerText || e.textContent || '').trim());
+const visible = e => e.offsetParent !== null;
+const pickSelect = () => {
+    for (const sel of document.querySelectorAll('select')) {
+        const opt = Array.from(sel.options).find(isRecent);
+        if (opt) {
+            sel.value = opt.value;
+            sel.dispatchEvent(new Event('change', {bubbles: true}));
+            return true;
+        }
+    }
+    return false;
+};
+const button = Array.from(document.querySelectorAll(
+    "button[aria-label='Sort by'], button[class*='sort'], button[data-testid*='sort']"
+)).find(visible);
+if (button) {
+    button.scrollIntoView({block: 'center'});
+    button.click();
+}
+const maxTries = button ? 30 : 1;
+return new Promise(resolve => {
+    let tries = 0;
+    const poll = () => {
+        const opt = Array.from(document.querySelectorAll(
+            "[role='option'], [role='menuitem'], [role='menuitemradio'], li, button, a, span, div"
+        )).find(e => visible(e) && isRecent(e));
+        if (opt) {
+            opt.click();
+            resolve(true);
+        } else if (++tries >= maxTries) {
+            resolve(pickSelect());
+        } else {
+            setTimeout(poll, 100);
+        }
+    };
+    poll();
+});
+"""
+
 def sort_reviews_by_most_recent(driver) -> bool:
-    """Enhanced function to sort reviews by 'Most recent' with multiple approaches."""
+    """Sort reviews by 'Most recent' with one in-page script instead of a find_elements cascade.
+
+    The option is clicked before the list re-renders, so this only returns True once the
+    first review from before the sort has gone stale; until then the DOM may still hold
+    the old order.
+    """
     try:
-        print("  📅 Attempting to sort reviews by 'Most recent'...")
-        
-        # Method 1: Look for dropdown button with "Most relevant" or similar text and click it
-        try:
-            # Your specific selector for the sort button
-            sort_button = driver.find_element(By.CSS_SELECTOR, 'button[aria-label="Sort by"]')
-            if sort_button and sort_button.is_displayed():
-                print("    → Found sort dropdown button, clicking...")
-                driver.execute_script("arguments[0].scrollIntoView({block:'center'});", sort_button)
-                time.sleep(0.5)
-                driver.execute_script("arguments[0].click();", sort_button)
-                time.sleep(1.0)
-                
-                # Now look for "Most recent" option in the dropdown
-                recent_options = driver.find_elements(By.XPATH, "//*[contains(text(), 'Most recent') or contains(text(), 'Most Recent') or contains(text(), 'Newest')]")
-                for opt in recent_options:
-                    try:
-                        if opt.is_displayed():
-                            print("    → Found 'Most recent' option, selecting...")
-                            driver.execute_script("arguments[0].click();", opt)
-                            time.sleep(1.0)
-                            return True
-                    except Exception:
-                        continue
-        except Exception as e:
-            print(f"    → Sort button method failed: {e}")
-        
-        # Method 2: Look for any button/element containing sort-related classes
-        try:
-            sort_candidates = driver.find_elements(By.CSS_SELECTOR, 
-                "button[class*='sort'], div[class*='sort'], button[data-testid*='sort']")
-            for candidate in sort_candidates:
-                try:
-                    if candidate.is_displayed() and ('sort' in candidate.get_attribute('class').lower() or 
-                                                     'sort' in (candidate.get_attribute('aria-label') or '').lower()):
-                        driver.execute_script("arguments[0].click();", candidate)
-                        time.sleep(1.0)
-                        
-                        # Look for recent options after click
-                        recent_options = driver.find_elements(By.XPATH, "//*[contains(text(), 'Most recent') or contains(text(), 'Newest') or contains(text(), 'Recent')]")
-                        for opt in recent_options:
-                            if opt.is_displayed():
-                                driver.execute_script("arguments[0].click();", opt)
-                                time.sleep(1.0)
-                                return True
-                except Exception:
-                    continue
-        except Exception:
-            pass
-        
-        # Method 3: Direct search for clickable "Most recent" text (fallback from original)
-        try:
-            mr_candidates = driver.find_elements(By.XPATH, "//*[contains(text(), 'Most recent') or contains(text(), 'Most Recent') or contains(text(), 'Newest')]")
-            for mc in mr_candidates:
-                try:
-                    if mc.is_displayed():
-                        driver.execute_script("arguments[0].scrollIntoView({block:'center'});", mc)
-                        driver.execute_script("arguments[0].click();", mc)
-                        time.sleep(1.0)
-                        print("    → Successfully clicked 'Most recent' text")
-                        return True
-                except Exception:
-                    continue
-        except Exception:
-            pass
-        
-        # Method 4: Look for select dropdowns
+        log.debug("  📅 Attempting to sort reviews by 'Most recent'...")
+        old_first = (driver.find_elements(By.CSS_SELECTOR, "div.f7.gray")[:1]
+                     or driver.find_elements(By.CSS_SELECTOR, _REVIEW_NODE_SELECTOR)[:1])
+        if not driver.execute_script(_SORT_MOST_RECENT_JS):
+            log.debug("    → Could not find or click 'Most recent' sort option")
+            return False
+        if not old_first:
+            log.debug("    → No review on the page to confirm the new order")
+            return False
         try:
-            selects = driver.find_elements(By.TAG_NAME, "select")
-            for s in selects:
-                try:
-                    for opt in s.find_elements(By.TAG_NAME, "option"):
-                        opt_text = (opt.text or '').lower()
-                        if 'most recent' in opt_text or 'newest' in opt_text or 'recent' in opt_text:
-                            opt.click()
-                            time.sleep(1.0)
-                            print("    → Successfully selected 'Most recent' from dropdown")
-                            return True
-                except Exception:
-                    continue
-        except Exception:
-            pass
-            
-        print("    → Could not find or click 'Most recent' sort option")
-        return False
-        
+            WebDriverWait(driver, WAIT_TIMEOUT).until(EC.staleness_of(old_first[0]))
+        except TimeoutException:
+            log.debug("    → Reviews did not re-render after sorting")
+            return False
+        wait_for(driver, (By.CSS_SELECTOR, _REVIEW_NODE_SELECTOR))
+        return True
     except Exception as e:
-        print(f"    → Error in sort_reviews_by_most_recent: {e}")
+        log.warning("    → Error in sort_reviews_by_most_recent: %s", e)
         return False
 
-def product_passes_filters(driver, product_url: str, target_month: int, target_year: int, target_display: str) -> tuple[bool, str]:
+# brand or reviews link: the parts of a product page the filters read first. The title
+# heading is on every product page, so pages without either link do not wait out the timeout.
+_PRODUCT_READY_SELECTOR = (
+    "[data-dca-name='ItemBrandLink'], [data-testid='item-review-section-link'], "
+    "a[data-automation-id='reviews-link'], h1#main-title, h1[itemprop='name']"
+)
+_REVIEW_NODE_SELECTOR = (
+    "div.f7.gray, [data-automation-id*='review'], li[class*='review'], "
+    "div[class*='review'], div[data-testid*='review']"
+)
+_F7_GRAY = "contains(concat(' ', normalize-space(@class), ' '), ' f7 ') and contains(concat(' ', normalize-space(@class), ' '), ' gray ')"
+# _REVIEW_NODE_SELECTOR as XPath; lxml returns the union in document order
+_REVIEW_NODES_XPATH = etree.XPath(
+    f"//div[{_F7_GRAY}] | //*[contains(@data-automation-id, 'review')] | //li[contains(@class, 'review')]"
+    " | //div[contains(@class, 'review')] | //div[contains(@data-testid, 'review')]"
+)
+_NESTED_DATE_XPATH = etree.XPath(f".//div[{_F7_GRAY}] | .//*[contains(@class, 'date')]")
+
+def _node_text(el) -> str:
+    """Visible-ish text of an lxml node, with its text runs separated by spaces."""
+    return " ".join(t.strip() for t in el.itertext() if t.strip())
+
+def review_dates_from_html(html: str, limit: int) -> list[datetime]:
+    """Dates of the first `limit` reviews in rendered page HTML, in document order
+    (newest first once sorted).
+
+    The review selectors also match wrappers around the list and the date div inside
+    each tile, so only the innermost matching node that yields a date is kept: one date
+    per review. Tiles without a month name fall back to a nested date node.
+    """
+    try:
+        tree = lxml.html.fromstring(html)
+    except (etree.ParserError, ValueError):
+        return []
+    dated = []
+    for el in _REVIEW_NODES_XPATH(tree):
+        txt = _node_text(el)
+        if not _HAS_MONTH_RE.search(txt):
+            date_els = _NESTED_DATE_XPATH(el)
+            if date_els:
+                txt = _node_text(date_els[0])
+        d = parse_review_date(txt)
+        if d:
+            dated.append((el, d))
+    # drop every node that contains another dated node
+    outer = set()
+    for el, _ in dated:
+        for anc in el.iterancestors():
+            if anc in outer:
+                break
+            outer.add(anc)
+    return [d for el, d in dated if el not in outer][:limit]
+
+@lru_cache(maxsize=None)
+def _target_hint_re(target_month: int, target_year: int) -> re.Pattern:
+    """Raw-HTML test for anything that could parse to a date in the target month.
+
+    An absolute date needs the month's name; a relative one needs 'ago', or
+    'today'/'yesterday' while the target month is still that recent.
+    """
+    full = MONTHS[target_month-1]
+    names = [full] if len(full) <= 3 else [full, full[:3]] + (["sept"] if target_month == 9 else [])
+    hints = [rf"\b(?:{'|'.join(names)})\b", r"\bago\b"]
+    now = datetime.now()
+    yesterday = now - timedelta(days=1)
+    if (target_year, target_month) in {(now.year, now.month), (yesterday.year, yesterday.month)}:
+        hints.append(r"\btoday\b|\byesterday\b")
+    return re.compile("|".join(hints), re.IGNORECASE)
+
+def review_month_verdict(html: str, target_month: int, target_year: int, target_display: str, newest_first: bool) -> tuple[bool, str]:
+    """Count target-month reviews in rendered reviews HTML and return (passed, reason).
+
+    newest_first allows stopping once OLDER_IN_A_ROW reviews in a row are older than
+    the target month. A single older date is not enough: a featured or "most helpful"
+    review can sit ahead of the sorted list.
+    """
+    count_in_month = 0
+    max_scan = 150
+    dates_found = []
+    debug = log.isEnabledFor(logging.DEBUG)
+    # (year, month) packed into one int: month < 16, so ordering matches the tuple
+    target_key = (target_year << 4) | target_month
+
+    # one regex pass over the raw page decides most misses without building a tree
+    if not _target_hint_re(target_month, target_year).search(html):
+        return False, f"Discarded: Only 0 reviews in target {target_display}."
+
+    dates = review_dates_from_html(html, max_scan)
+    older = 0
+
+    for d in dates:
+        if debug:
+            dates_found.append(format_date_for_comparison(d))
+        key = (d.year << 4) | d.month
+        if key == target_key:
+            count_in_month += 1
+            if count_in_month >= MIN_REVIEWS_IN_MONTH:
+                break
+        # newest-first order: once past the target month nothing later can match
+        if key < target_key:
+            older += 1
+            if newest_first and older >= OLDER_IN_A_ROW:
+                break
+        else:
+            older = 0
+
+    if dates_found:
+        unique_dates = sorted(set(dates_found))
+        log.debug("     → Dates found in reviews: %s (looking for %s)", ", ".join(unique_dates), target_display)
+    elif not dates:
+        log.debug("     → No parseable review dates found")
+
+    # Final check based on review count.
+    if count_in_month < MIN_REVIEWS_IN_MONTH:
+        return False, f"Discarded: Only {count_in_month} reviews in target {target_display}."
+    else:
+        return True, f"PASS: Product has at least {count_in_month} reviews in target {target_display}."
+
+def product_passes_filters(driver, product_url: str, target_month: int, target_year: int, target_display: str,
+                           review_verdict: tuple[bool, str] | None = None) -> tuple[bool, str]:
     """
     Opens a product page and applies the requested filters.
     
@@ -409,6 +648,8 @@ def product_passes_filters(driver, product_url: str, target_month: int, target_y
         target_month (int): The month (1-12) to check for reviews.
         target_year (int): The year to check for reviews.
         target_display (str): A string representing the target month/year for logging.
+        review_verdict (tuple[bool, str] | None): Result of a review count already done over
+                         HTTP. When given, only the sellers check runs in the browser.
     
     Returns:
         Tuple[bool, str]: A tuple containing a boolean indicating if the product passes
@@ -417,7 +658,14 @@ def product_passes_filters(driver, product_url: str, target_month: int, target_y
     """
     try:
         driver.get(product_url)
-        time.sleep(1.0)
+        ready = wait_for(driver, (By.CSS_SELECTOR, _PRODUCT_READY_SELECTOR))
+        # a bot-check page has no sellers button either; report it as an error so the
+        # product is retried instead of discarded as single-seller
+        if "/blocked" in driver.current_url or (not ready and _BOT_RE.search(driver.title)):
+            return False, "Error during check: bot check"
+        # anything read from a half-loaded page would be cached as a real verdict
+        if not ready:
+            return False, "Error during check: product page did not load"
 
         brand_name = extract_brand_from_page(driver)
         brand_l = brand_name.lower() if brand_name else ""
@@ -454,25 +702,12 @@ def product_passes_filters(driver, product_url: str, target_month: int, target_y
             except Exception:
                 pass
             
-            seller_names = []
             try:
-                # Try multiple selectors to find seller names
-                seller_selectors = [
-                    "a[data-automation-id='seller-name-link']",
-                    "div[data-automation-id='seller-name']",
-                    "span[class*='seller']",
-                    "li.seller",
-                    "div.seller"
-                ]
-                for sel in seller_selectors:
-                    try:
-                        elems = driver.find_elements(By.CSS_SELECTOR, sel)
-                        for el in elems:
-                            txt = (el.text or "").strip()
-                            if txt:
-                                seller_names.append(txt)
-                    except Exception:
-                        continue
+                # Every seller-name candidate's text in one round-trip
+                seller_names = driver.execute_script(
+                    "return Array.from(document.querySelectorAll(arguments[0]), e => e.innerText || '');",
+                    _SELLER_SELECTOR,
+                ) or []
                 # Remove duplicates and normalize seller names
                 seller_names = list(dict.fromkeys([s.strip() for s in seller_names if s.strip()]))
             except Exception:
@@ -484,13 +719,16 @@ def product_passes_filters(driver, product_url: str, target_month: int, target_y
                 return False, f"Discarded: brand-store seller '{brand_name}' detected in sellers list"
 
             # Discard if a specific "Visit the store <Brand>" link is found.
-            if any(re.search(r"visit\s+the\s+store\s+" + re.escape(brand_name), s, re.IGNORECASE) for s in seller_names if brand_name):
+            if brand_l and any(m and m.group(1).lower().startswith(brand_l) for m in map(_VISIT_STORE_RE.search, seller_names)):
                 click_close_popup(driver)
                 return False, f"Discarded: 'Visit the store {brand_name}' found in sellers popup"
 
             # Close the popup before proceeding.
             click_close_popup(driver)
 
+        if review_verdict is not None:
+            return review_verdict
+
         # 2) Navigate to the reviews section
         try:
             rev_link = None
@@ -514,87 +752,18 @@ def product_passes_filters(driver, product_url: str, target_month: int, target_y
                     rev_link.click()
                 except Exception:
                     pass
-            time.sleep(1.0)
+            reviews_loaded = wait_for(driver, (By.CSS_SELECTOR, _REVIEW_NODE_SELECTOR))
         except Exception:
             return False, "Discarded: failed to open reviews"
+        if not reviews_loaded:
+            return False, "Error during check: reviews did not load"
 
         # 3) Sort reviews by "Most recent"
         sort_success = sort_reviews_by_most_recent(driver)
         if sort_success:
-            print("     → Successfully sorted by 'Most recent'")
+            log.debug("     → Successfully sorted by 'Most recent'")
         else:
-            print("     → Warning: Could not sort by 'Most recent', continuing anyway...")
-
-        # 4) Count reviews from the target month and year
-        time.sleep(0.6)
-        
-        review_elements = []
-        try:
-            date_divs = driver.find_elements(By.CSS_SELECTOR, "div.f7.gray")
-            review_elements.extend(date_divs)
-        except Exception:
-            pass
-        
-        try:
-            date_pattern_divs = driver.find_elements(By.XPATH, "//div[contains(text(), '2024') or contains(text(), '2025') or contains(text(), '2026')]")
-            review_elements.extend(date_pattern_divs)
-        except Exception:
-            pass
-        
-        try:
-            review_tiles = driver.find_elements(By.CSS_SELECTOR, "[data-automation-id*='review'], li[class*='review'], div[class*='review'], div[data-testid*='review']")
-            review_elements.extend(review_tiles)
-        except Exception:
-            pass
-
-        if not review_elements:
-            try:
-                review_elements = driver.find_elements(By.XPATH, "//div[contains(@class,'review') or contains(@data-automation-id,'review') or contains(@data-testid,'review')]")
-            except Exception:
-                pass
-
-        count_in_month = 0
-        scanned = 0
-        max_scan = 150
-        dates_found = []
-        
-        unique_review_elements = list(set(review_elements))
-
-        for elem in unique_review_elements:
-            if scanned >= max_scan:
-                break
-            scanned += 1
-            try:
-                txt = elem.text or elem.get_attribute('innerText') or ''
-                
-                if not any(month in txt for month in ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']):
-                    try:
-                        date_elem = elem.find_element(By.CSS_SELECTOR, "div.f7.gray, .date, [class*='date']")
-                        txt = date_elem.text or date_elem.get_attribute('innerText') or ''
-                    except:
-                        try:
-                            parent = elem.find_element(By.XPATH, "..")
-                            date_elem = parent.find_element(By.CSS_SELECTOR, "div.f7.gray")
-                            txt = date_elem.text or date_elem.get_attribute('innerText') or ''
-                        except:
-                            pass
-                            
-            except Exception:
-                txt = ''
-            
-            if txt.strip():
-                d = parse_review_date(txt)
-                if d:
-                    date_format = format_date_for_comparison(d)
-                    dates_found.append(date_format)
-                    if d.month == target_month and d.year == target_year:
-                        count_in_month += 1
-
-        if dates_found:
-            unique_dates = sorted(set(dates_found))
-            print(f"     → Dates found in reviews: {', '.join(unique_dates)} (looking for {target_display})")
-        else:
-            print(f"     → No parseable dates found in {scanned} elements")
+            log.warning("     → Warning: Could not sort by 'Most recent', continuing anyway...")
 
         # NEW LOGIC: Check for "Review from" as a separate, immediate filter
         #try:
@@ -604,18 +773,156 @@ def product_passes_filters(driver, product_url: str, target_month: int, target_y
        # except Exception:
          #   pass
 
-        # Final check based on review count.
-        if count_in_month < 5:
-            return False, f"Discarded: Only {count_in_month} reviews in target {target_display}."
-        else:
-            return True, f"PASS: Product has {count_in_month} reviews in target {target_display}."
+        # 4) Count reviews from the target month and year
+        # the sorted reviews are static now: fetch the DOM once and parse it locally.
+        # Without a confirmed re-sort the order is unknown, so no early exit.
+        return review_month_verdict(driver.page_source, target_month, target_year, target_display, sort_success)
 
     except Exception as e:
         return False, f"Error during check: {e}"
 
+# ---------- HTTP review fetch ----------
+def product_id_from_link(link: str) -> str | None:
+    """Walmart item id: the trailing number of a canonical /ip/ link."""
+    last = link.rstrip("/").rsplit("/", 1)[-1]
+    return last if last.isdigit() else None
+
+# review markup anywhere in a served page; without it the page is not a reviews page
+_REVIEW_MARKUP_RE = re.compile(r"""(?:class|data-automation-id|data-testid)=["'][^"']*review|\bf7 gray\b""")
+
+async def _fetch_review_verdicts(links, cookies, user_agent, target_month, target_year, target_display, on_verdict, stop):
+    sem = asyncio.Semaphore(HTTP_CONCURRENCY)
+    headers = {"User-Agent": user_agent, "Accept": "text/html,application/xhtml+xml", "Accept-Language": "en-US,en;q=0.9"}
+
+    async def fetch_one(client, link):
+        item_id = product_id_from_link(link)
+        if not item_id:
+            return link, None
+        async with sem:
+            try:
+                resp = await client.get(REVIEWS_URL.format(item_id=item_id))
+            except httpx.HTTPError:
+                return link, None
+        # blocked or redirected away from the reviews page: leave it to the browser
+        if resp.status_code != 200 or "/reviews/product/" not in resp.url.path:
+            return link, None
+        # a page that can't be decoded or parsed goes to the browser check like any other
+        try:
+            html = resp.text
+            # a plain regex test, so review_month_verdict is the only parse of the page
+            if not _REVIEW_MARKUP_RE.search(html):
+                return link, None
+            log.debug("  🌐 Reviews fetched: %s", link)
+            return link, review_month_verdict(html, target_month, target_year, target_display, newest_first=True)
+        except Exception as e:
+            log.debug("  🌐 Could not parse reviews for %s: %s", link, e)
+            return link, None
+
+    async with httpx.AsyncClient(headers=headers, cookies=cookies, follow_redirects=True, timeout=HTTP_TIMEOUT) as client:
+        tasks = {asyncio.create_task(fetch_one(client, link)) for link in links}
+        try:
+            # short waits so a set stop flag is seen even while every request is in flight
+            while tasks and not stop.is_set():
+                done, tasks = await asyncio.wait(tasks, timeout=0.5, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    on_verdict(*task.result())
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+def fetch_review_verdicts(driver, links, target_month, target_year, target_display, on_verdict, stop):
+    """Count target-month reviews for many products concurrently over HTTP, reusing the
+    browser session's cookies and user agent. Calls on_verdict(link, (passed, reason))
+    as each page completes, with None instead of the verdict when the reviews page could
+    not be fetched or parsed. Returns early, leaving the rest unchecked, once stop is set.
+    """
+    cookies = {c["name"]: c["value"] for c in driver.get_cookies()}
+    user_agent = driver.execute_script("return navigator.userAgent;")
+    asyncio.run(_fetch_review_verdicts(links, cookies, user_agent, target_month, target_year, target_display, on_verdict, stop))
+
+# ---------- Filter workers ----------
+_worker_driver = None
+_worker_target = None  # (target_month, target_year, target_display), fixed for the whole run
+_worker_error = None  # why this worker's browser failed to start
+
+def _init_filter_worker(cookies_path, target, log_queue, log_level):
+    """Pool initializer: open this worker's own browser and seed it with the main session's cookies."""
+    global _worker_driver, _worker_target, _worker_error
+    _log_to_queue(log_queue, log_level)
+    _worker_target = target
+    # pool.terminate() sends SIGTERM; exit cleanly so the finalizer closes Chrome.
+    # Ctrl+C reaches the whole process group; only the main process acts on it.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # A raising initializer makes Pool restart the worker forever without any result
+    # reaching the main loop, so a failed start is reported per product instead.
+    try:
+        # Selenium drivers can't be shared across processes, so each worker owns one.
+        # user_multi_procs stops workers from re-patching the same chromedriver binary.
+        _worker_driver = make_driver(headless=WORKER_HEADLESS, block_assets=True, user_multi_procs=True)
+        Finalize(None, _worker_driver.quit, exitpriority=10)
+        _worker_driver.get("https://www.walmart.com/")
+        load_cookies(_worker_driver, cookies_path)
+        _worker_driver.refresh()
+    except Exception as e:
+        _worker_error = e
+        log.warning("⚠️ Worker browser failed to start: %s", e)
+
+def _check_product(job):
+    """Run product_passes_filters in a worker; returns (link, passed, reason)."""
+    link, review_verdict = job
+    if _worker_error is not None:
+        return link, False, f"Error during check: worker startup failed: {_worker_error}"
+    passed, reason = product_passes_filters(_worker_driver, link, *_worker_target, review_verdict)
+    return link, passed, reason
+
 # ---------- Main pipeline ----------
-def run_scraper():
+def _write_batch(writer, fh, rows):
+    """Write buffered CSV rows with one writerows call, clear the batch and flush the file."""
+    if rows:
+        writer.writerows(rows)
+        rows.clear()
+    fh.flush()
+
+def links_in_status_log(target_tag, path=STATUS_CSV) -> set[str] | None:
+    """Links an earlier, possibly interrupted, run already settled for target_tag.
+
+    Error rows are left out so those products are retried, as the verdict cache does.
+    Returns None when there is no log or it was written for another target month.
+    """
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = csv.reader(f)
+            header = next(rows, [])
+            if "target" not in header:
+                return None
+            link_i, reason_i, target_i = header.index("product_link"), header.index("reason"), header.index("target")
+            done = set()
+            for row in rows:
+                if len(row) != len(header):
+                    continue
+                if row[target_i] != target_tag:
+                    return None
+                if not row[reason_i].startswith("Error during check"):
+                    done.add(row[link_i])
+            return done
+    except (OSError, ValueError):
+        return None
+
+def max_links_from_env() -> int:
+    """MAX_LINKS environment variable: check only the first N collected links, for quick
+    test runs. Unset, 0 or anything that isn't a whole number means all of them."""
+    raw = os.getenv("MAX_LINKS", "").strip()
+    try:
+        return max(int(raw or 0), 0)
+    except ValueError:
+        log.warning(f"⚠️ Ignoring MAX_LINKS={raw!r}: not a whole number")
+        return 0
+
+def run_scraper(log_queue):
     print("=== Walmart Link Scraper + Filters ===")
+    max_links = max_links_from_env()
     #keyword = input("Enter search keyword (blank for full URL): ").strip()
     #if not keyword:
         #base_url = input("Paste full Walmart search URL: ").strip()
@@ -636,17 +943,21 @@ def run_scraper():
         scrape_all = True
 
     target_month, target_year, target_display = ask_target_month_year()
+    target_tag = f"{target_year}-{target_month:02d}"
+    # an earlier run for the same month that stopped part way can carry on instead of
+    # starting over; a log for another month is replaced
+    resume, done = False, set()
+    earlier = links_in_status_log(target_tag)
+    if earlier is not None:
+        resume = input(f"Resume the previous {target_display} run from {STATUS_CSV}? (y/N): ").strip().lower() == "y"
+        if resume:
+            done = earlier
+    elif os.path.exists(STATUS_CSV):
+        print(f"ℹ️ {STATUS_CSV} is not from a {target_display} run; it will be replaced.")
     #zip_code = input(f"Enter ZIP (default {DEFAULT_ZIP}): ").strip() or DEFAULT_ZIP
     zip_code = DEFAULT_ZIP
-    print("\nOpening browser...")
-    options = uc.ChromeOptions()
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_argument("--incognito")
-    options.add_argument("--disable-web-security")
-    options.add_argument("--disable-features=VizDisplayCompositor")
-    
-    driver = uc.Chrome(options=options, headless=False)
-    driver.set_window_size(1400,900)
+    log.info("Opening browser...")
+    driver = make_driver(user_data_dir=os.path.abspath(PROFILE_DIR))
 
     def make_url(page):
         if use_full_url:
@@ -659,75 +970,196 @@ def run_scraper():
             q = keyword.replace(" ","+")
             return f"https://www.walmart.com/search?q={q}&zipcode={zip_code}&page={page}"
 
-    collected_all, passed_links, status_rows = [], [], []
+    # links are deduplicated as pages come in, keeping first-seen order
+    seen, ordered_links = set(), []
+
+    def add_links(links):
+        for link in links:
+            if link not in seen:
+                seen.add(link)
+                ordered_links.append(link)
+
+    passed_count = checked_count = 0
+    resumed_count = capped_count = 0  # collected links left out by resume / MAX_LINKS
 
     try:
         # Navigate to initial page for bot verification
         initial_url = make_url(1)
-        print(f"\nNavigating to: {initial_url}")
+        log.info(f"Navigating to: {initial_url}")
         driver.get(initial_url)
         
-        # Perform bot verification check at startup
-        verify_bot_detection(driver)
-        
-        # Load cookies after verification
-        load_cookies(driver)
-        driver.refresh()
-        time.sleep(2)
+        # The profile keeps the verified session, so later runs skip the manual check
+        # unless the page is challenged again
+        checked_now = not os.path.exists(VERIFIED_FILE) or bool(_BOT_RE.search(driver.title))
+        if checked_now:
+            verify_bot_detection(driver)
+            open(VERIFIED_FILE, "w").close()
+        else:
+            log.info("✅ Reusing verified browser profile, skipping bot check.")
+
+        def collect_page():
+            # an empty page from a skipped check usually means the stored session was challenged
+            nonlocal checked_now
+            links = collect_links_from_search_page(driver)
+            if not links and not checked_now:
+                log.warning("⚠️ No products found; the saved session may need verifying again.")
+                verify_bot_detection(driver)
+                checked_now = True
+                links = collect_links_from_search_page(driver)
+            return links
 
         if single_page:
             if single_page != 1:  # If not page 1, navigate to the correct page
                 url = make_url(single_page)
                 driver.get(url)
-                time.sleep(2)
-            links = collect_links_from_search_page(driver)
-            collected_all.extend(links)
+            links = collect_page()
+            add_links(links)
         elif range_start:
             for pg in range(range_start, range_end+1):
                 if pg != 1:  # Skip navigation for page 1 as we're already there
                     url = make_url(pg)
                     driver.get(url)
-                    time.sleep(2)
-                links = collect_links_from_search_page(driver)
-                collected_all.extend(links)
-                print(f"Page {pg}: Found {len(links)} links")
+                links = collect_page()
+                add_links(links)
+                log.info(f"Page {pg}: Found {len(links)} links")
         else:
             pg = 1
             while True:
-                links = collect_links_from_search_page(driver)
-                collected_all.extend(links)
-                print(f"Page {pg}: Found {len(links)} links")
+                links = collect_page()
+                add_links(links)
+                log.info(f"Page {pg}: Found {len(links)} links")
                 if pg >= MAX_PAGES_SAFETY: 
-                    print(f"Reached safety limit of {MAX_PAGES_SAFETY} pages")
+                    log.info(f"Reached safety limit of {MAX_PAGES_SAFETY} pages")
                     break
                 if not click_next(driver): 
-                    print("No more pages found")
+                    log.info("No more pages found")
                     break
                 pg += 1
 
-        # Deduplicate while preserving order
-        seen = set()
-        ordered_links = []
-        for l in collected_all:
-            if l not in seen:
-                seen.add(l)
-                ordered_links.append(l)
+        log.info(f"Collected {len(ordered_links)} unique products. Starting filtering...")
+        if done:
+            ordered_links = [link for link in ordered_links if link not in done]
+            resumed_count = len(seen) - len(ordered_links)
+            log.info(f"⏭️ Resuming: {resumed_count} already in {STATUS_CSV}, {len(ordered_links)} left")
+        if max_links and len(ordered_links) > max_links:
+            capped_count = len(ordered_links) - max_links
+            ordered_links = ordered_links[:max_links]
+            log.info(f"MAX_LINKS is set: checking only the first {max_links}")
 
-        print(f"\nCollected {len(ordered_links)} unique products. Starting filtering...")
+        # Worker browsers start from the cookies of this verified session
+        save_cookies(driver)
+        # Results are written as they arrive, so an interrupted run keeps what it checked.
+        # A resumed run appends to the earlier files; headers go only into empty ones.
+        mode = "a" if resume else "w"
+        with (
+            closing(open_checked_db()) as checked_db,
+            open(OUTPUT_CSV, mode, newline="", encoding="utf-8") as pf,
+            open(STATUS_CSV, mode, newline="", encoding="utf-8", buffering=CSV_BUFFER) as sf,
+        ):
+            passed_writer = csv.writer(pf)
+            if not pf.tell():
+                passed_writer.writerow(["product_link"])
+            status_writer = csv.writer(sf)
+            if not sf.tell():
+                status_writer.writerow(["product_link","status","reason","target"])
+            status_batch = []
+            total = len(ordered_links)
 
-        try:
-            for idx, link in enumerate(ordered_links, 1):
-                print(f"\n[{idx}/{len(ordered_links)}] Checking: {link}")
-                passed, reason = product_passes_filters(driver, link, target_month, target_year, target_display)
+            def record(link, passed, reason):
+                """Write one result to the status log (and passes file) and cache its verdict."""
+                nonlocal passed_count, checked_count
+                checked_count += 1
+                if checked_count % LOG_PROGRESS_EVERY == 0 or log.isEnabledFor(logging.DEBUG):
+                    log.info("[%d/%d] Checked: %s", checked_count, total, link)
                 status = "PASS" if passed else "FAIL"
-                status_rows.append({'product_link':link,'status':status,'reason':reason})
+                # errors are worth retrying next run, so only real verdicts are kept
+                if link not in checked and not reason.startswith("Error during check"):
+                    save_checked(checked_db, target_tag, link, status, reason)
+                if checked_count % CHECKED_COMMIT_EVERY == 0:
+                    checked_db.commit()
+                status_batch.append((link, status, reason, target_tag))
                 if passed: 
-                    passed_links.append(link)
-                    print(f"  ✅ PASSED: {reason}")
+                    # passes are few and are the run's output: write each one through at once
+                    passed_writer.writerow([link])
+                    pf.flush()
+                    passed_count += 1
+                    log.info("  ✅ PASSED: %s: %s", link, reason)
+                elif reason.startswith("Error during check"):
+                    log.warning("  ⚠️ ERROR: %s: %s", link, reason)
                 else:
-                    print(f"  ❌ FAILED: {reason}")
-        except KeyboardInterrupt:
-            print("\n⏸️ Interrupted! Saving partial results...")
+                    log.debug("  ❌ FAILED: %s: %s", link, reason)
+                if len(status_batch) >= CSV_BATCH:
+                    _write_batch(status_writer, sf, status_batch)
+
+            # Ctrl+C only sets a flag; each phase stops before its next product and every
+            # result so far is written out below. A second Ctrl+C interrupts for real, in
+            # case the run is stuck waiting for a result that never comes.
+            stop = threading.Event()
+
+            def on_sigint(signum, frame):
+                if stop.is_set():
+                    signal.signal(signal.SIGINT, previous_sigint)
+                    raise KeyboardInterrupt
+                stop.set()
+                # plain write: logging and print aren't safe to re-enter from a signal handler
+                os.write(sys.stderr.fileno(), b"\nStopping after the current product; press Ctrl+C again to abort.\n")
+
+            previous_sigint = signal.signal(signal.SIGINT, on_sigint)
+            pool, pool_closed = None, False
+            try:
+                # Links already checked for this month reuse their verdict instead of a page load
+                checked = load_checked(checked_db, target_tag)
+                pending = []
+                for link in ordered_links:
+                    hit = checked.get(link)
+                    if hit:
+                        record(link, *hit)
+                    else:
+                        pending.append(link)
+                if checked_count:
+                    log.info(f"♻️ Reused {checked_count} verdict(s) from earlier runs for {target_display}")
+
+                # Review counts come from the reviews pages over plain HTTP. Products that fail
+                # there are recorded as soon as their page arrives; the rest still need the
+                # browser for the sellers popup.
+                jobs = []
+
+                def on_review_verdict(link, verdict):
+                    if verdict and not verdict[0]:
+                        record(link, *verdict)
+                    else:
+                        jobs.append((link, verdict))
+
+                if pending and not stop.is_set():
+                    log.info(f"🌐 Fetching reviews for {len(pending)} product(s) over HTTP...")
+                    fetch_review_verdicts(driver, pending, target_month, target_year, target_display, on_review_verdict, stop)
+
+                workers = min(FILTER_WORKERS, len(jobs))
+                if workers and not stop.is_set():
+                    log.info(f"Checking products with {workers} browser worker(s)...")
+                    pool = multiprocessing.Pool(
+                        processes=workers, initializer=_init_filter_worker,
+                        initargs=(COOKIES_FILE, (target_month, target_year, target_display), log_queue, log.level),
+                    )
+                    for link, passed, reason in pool.imap_unordered(_check_product, jobs):
+                        # a product finished after Ctrl+C is still kept
+                        record(link, passed, reason)
+                        if stop.is_set():
+                            break
+                if stop.is_set():
+                    log.warning("⏸️ Interrupted! Keeping results checked so far...")
+                elif pool:
+                    pool.close()
+                    pool_closed = True
+            finally:
+                signal.signal(signal.SIGINT, previous_sigint)
+                # interrupted or failed part way: stop the workers (and their browsers) now
+                if pool:
+                    if not pool_closed:
+                        pool.terminate()
+                    pool.join()
+                _write_batch(status_writer, sf, status_batch)
+                checked_db.commit()
 
     finally:
         save_cookies(driver)
@@ -736,28 +1168,28 @@ def run_scraper():
         except: 
             pass
 
-    # Save results
-    if passed_links:
-        with open(OUTPUT_CSV,"w",newline="",encoding="utf-8") as f:
-            w=csv.writer(f)
-            w.writerow(["product_link"])
-            for l in passed_links: 
-                w.writerow([l])
-        print(f"✅ Saved {len(passed_links)} passing links to {OUTPUT_CSV}")
+    if passed_count:
+        log.info(f"✅ Saved {passed_count} passing links to {OUTPUT_CSV}")
     else:
-        print("❌ No links passed the filters")
+        log.info("❌ No links passed the filters")
         
-    if status_rows:
-        with open(STATUS_CSV,"w",newline="",encoding="utf-8") as f:
-            w=csv.DictWriter(f,fieldnames=["product_link","status","reason"])
-            w.writeheader()
-            w.writerows(status_rows)
-        print(f"📄 Status log saved to {STATUS_CSV}")
+    if checked_count:
+        log.info(f"📄 Status log saved to {STATUS_CSV}")
     
-    print(f"\n📊 Summary:")
-    print(f"   Total products found: {len(ordered_links)}")
-    print(f"   Passed filters: {len(passed_links)}")
-    print(f"   Failed filters: {len(status_rows) - len(passed_links)}")
+    log.info("📊 Summary:")
+    log.info(f"   Total products found: {len(seen)}")
+    if resumed_count:
+        log.info(f"   Skipped, already in {STATUS_CSV}: {resumed_count}")
+    if capped_count:
+        log.info(f"   Left out by MAX_LINKS: {capped_count}")
+    log.info(f"   Passed filters: {passed_count}")
+    log.info(f"   Failed filters: {checked_count - passed_count}")
+    if checked_count < len(ordered_links):
+        log.info(f"   Not checked (interrupted): {len(ordered_links) - checked_count}")
 
 if __name__=="__main__":
-    run_scraper()
\ No newline at end of file
+    log_queue, log_listener = start_logging()
+    try:
+        run_scraper(log_queue)
+    finally:
+        log_listener.stop()
\ No newline at end of file